@@ -0,0 +1,127 @@
+"""Incremental asset matching over the indicator snapshot.
+
+Same matching rules as `filter_threats_by_assets` in mcp_server.py, but kept as a
+per-asset match map: each distinct (software, version) asset maps to the indicator
+positions it matches, and the relevant set is the union of those plus CVEs. When the
+asset list changes only the added or removed assets are matched, against a search
+index built once per snapshot.
+
+The index concatenates every indicator's lowercased "name, value, tags" text into one
+corpus, so matching an asset is a handful of C-level `str.find` scans instead of a
+Python loop over every indicator.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+from bisect import bisect_right
+from collections import Counter
+import threading
+
+AssetKey = Tuple[str, str]
+
+# Never appear in asset names, so a match cannot span two indicators or two fields
+DOC_SEP = "\x01"
+FIELD_SEP = "\x00"
+
+
+def asset_key(asset: Dict[str, Any]) -> AssetKey:
+    return ((asset.get("software") or "").lower(), (asset.get("version") or "").lower())
+
+
+class _Corpus:
+    def __init__(self, docs: List[str]):
+        self.text = DOC_SEP.join(docs)
+        self.starts: List[int] = []
+        pos = 0
+        for doc in docs:
+            self.starts.append(pos)
+            pos += len(doc) + 1
+
+    def find_all(self, needle: str) -> Set[int]:
+        """Indices of documents containing `needle`."""
+        hits: Set[int] = set()
+        if not needle or DOC_SEP in needle:
+            return hits
+        text, starts = self.text, self.starts
+        pos = text.find(needle)
+        while pos != -1:
+            doc = bisect_right(starts, pos) - 1
+            hits.add(doc)
+            if doc + 1 >= len(starts):
+                break
+            pos = text.find(needle, starts[doc + 1])
+        return hits
+
+
+class AssetMatchIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indicators: Optional[List[Dict[str, Any]]] = None
+        self._assets: Counter = Counter()
+        self._matches: Dict[AssetKey, Set[int]] = {}
+        self._hits: Counter = Counter()
+        self._positions: Set[int] = set()
+        self._result: Optional[List[Dict[str, Any]]] = None
+
+    def _build(self, indicators: List[Dict[str, Any]]) -> None:
+        names, haystacks = [], []
+        self._cves: List[int] = []
+        for i, t in enumerate(indicators):
+            name = (t.get("threat_name") or "").lower()
+            value = (t.get("value") or "").lower()
+            tags = FIELD_SEP.join(tag.lower() for tag in (t.get("tags") or []))
+            names.append(name)
+            haystacks.append(f"{name}{FIELD_SEP}{value}{FIELD_SEP}{tags}")
+            if "cve" in t.get("type", "").lower():
+                self._cves.append(i)
+        self._names = _Corpus(names)
+        self._haystacks = _Corpus(haystacks)
+        self._indicators = indicators
+        self._assets = Counter()
+        self._matches = {}
+        self._hits = Counter()
+        # CVEs are relevant whenever any asset is defined
+        self._positions = set(self._cves)
+        self._result = None
+
+    def _match(self, key: AssetKey) -> Set[int]:
+        software, version = key
+        matched = self._haystacks.find_all(software) if software else set()
+        if version:
+            matched |= self._names.find_all(version)
+        return matched
+
+    def _sync_assets(self, assets: List[Dict[str, Any]]) -> None:
+        wanted = Counter(asset_key(a) for a in assets)
+        if wanted == self._assets:
+            return
+        hits, positions = self._hits, self._positions
+        for key in wanted.keys() - self._assets.keys():
+            matched = self._matches[key] = self._match(key)
+            hits.update(matched)
+            positions |= matched
+        for key in self._assets.keys() - wanted.keys():
+            matched = self._matches.pop(key)
+            hits.subtract(matched)
+            positions -= {i for i in matched if hits[i] <= 0}
+            positions.update(self._cves)
+        self._assets = wanted
+        self._result = None
+
+    def relevant(self, indicators: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Indicators matching any asset, in snapshot order (shared list; do not mutate)."""
+        if not assets:
+            return indicators
+        with self._lock:
+            if indicators is not self._indicators:
+                self._build(indicators)
+            self._sync_assets(assets)
+            if self._result is None:
+                self._result = [indicators[i] for i in sorted(self._positions)]
+            return self._result
+
+    def per_asset(self, indicators: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> Dict[AssetKey, List[Dict[str, Any]]]:
+        """Indicators matched by each asset (CVEs relevant to all assets are not included)."""
+        with self._lock:
+            if indicators is not self._indicators:
+                self._build(indicators)
+            self._sync_assets(assets)
+            return {key: [indicators[i] for i in sorted(matched)] for key, matched in self._matches.items()}
@@ -0,0 +1,89 @@
+"""Check that `AssetMatchIndex` agrees with `filter_threats_by_assets` on a seeded synthetic feed.
+
+Runs a sequence of random asset lists through one index, so both the initial match and
+incremental asset edits are covered, including version-only assets and assets with an
+empty software field. Prints every mismatch and exits non-zero if there are any:
+
+    python -m bench.check_asset_matching --pulses 300 --rounds 50
+"""
+from typing import Any, Dict, List
+import argparse
+import random
+import sys
+
+from asset_matching import AssetMatchIndex, asset_key
+from bench.synthetic_feed import generate_assets, generate_pulses
+from mcp_server import filter_threats_by_assets, normalize_pulses_to_indicators
+
+
+def random_assets(rng: random.Random, pool: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """A few inventory assets plus the edge cases the index special-cases."""
+    assets = [dict(a) for a in rng.sample(pool, rng.randint(0, min(6, len(pool))))]
+    for _ in range(rng.randint(0, 3)):
+        source = rng.choice(pool)
+        kind = rng.choice(["version-only", "empty-software", "no-version", "blank", "upper"])
+        if kind == "version-only":
+            assets.append({"name": "Unknown", "version": source["version"]})
+        elif kind == "empty-software":
+            assets.append({"name": source["name"], "software": "", "version": source["version"]})
+        elif kind == "no-version":
+            assets.append({"name": source["name"], "software": source["software"]})
+        elif kind == "blank":
+            assets.append({"name": source["name"], "software": "", "version": ""})
+        else:
+            assets.append({"name": source["name"], "software": source["software"].upper(), "version": source["version"]})
+    rng.shuffle(assets)
+    return assets
+
+
+def expected_per_asset(indicators: List[Dict[str, Any]], asset: Dict[str, Any]) -> List[int]:
+    """Positions `asset` matches by software/version alone (per_asset leaves out the blanket CVE rule)."""
+    neutral = [{**t, "type": "asset-check"} for t in indicators]
+    positions = {id(t): i for i, t in enumerate(neutral)}
+    return [positions[id(t)] for t in filter_threats_by_assets(neutral, [asset])]
+
+
+def check(pulses: int, indicators_per_pulse: int, rounds: int, seed: int) -> List[str]:
+    """Mismatch descriptions (empty when the index agrees on every round)."""
+    indicators = normalize_pulses_to_indicators(generate_pulses(pulses, indicators_per_pulse, seed=seed))
+    position = {id(t): i for i, t in enumerate(indicators)}
+    pool = generate_assets(20, seed)
+    rng = random.Random(seed)
+    index = AssetMatchIndex()
+    errors: List[str] = []
+
+    for round_no in range(rounds):
+        assets = random_assets(rng, pool)
+        expected = [position[id(t)] for t in filter_threats_by_assets(indicators, assets)]
+        actual = [position[id(t)] for t in index.relevant(indicators, assets)]
+        if actual != expected:
+            errors.append(f"round {round_no}: relevant() returned {len(actual)} indicators, "
+                          f"filter_threats_by_assets {len(expected)} (assets: {assets})")
+
+        per_asset = index.per_asset(indicators, assets)
+        for asset in assets:
+            want = expected_per_asset(indicators, asset)
+            got = [position[id(t)] for t in per_asset.get(asset_key(asset), [])]
+            if got != want:
+                errors.append(f"round {round_no}: per_asset() returned {len(got)} indicators for {asset}, expected {len(want)}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check AssetMatchIndex against filter_threats_by_assets")
+    parser.add_argument("--pulses", type=int, default=300)
+    parser.add_argument("--indicators", type=int, default=20, help="Mean indicators per pulse")
+    parser.add_argument("--rounds", type=int, default=50, help="Random asset lists to check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    errors = check(args.pulses, args.indicators, args.rounds, args.seed)
+    for error in errors:
+        print(error)
+    if errors:
+        sys.exit(1)
+    print(f"AssetMatchIndex matches filter_threats_by_assets on {args.rounds} asset lists")
+
+
+if __name__ == "__main__":
+    main()
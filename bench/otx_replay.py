@@ -0,0 +1,148 @@
+"""Record real OTX `pulses/subscribed` responses and replay them from a local stand-in server.
+
+Record (needs OTX_API_KEY and network access):
+
+    python -m bench.otx_replay record --pages 5 --limit 100 --dir bench/recordings
+
+Replay, then point the MCP server at it with OTX_BASE_URL=http://127.0.0.1:9100 (no OTX_API_KEY
+needed) and a low SNAPSHOT_TTL_SECONDS (0 fetches on every request), otherwise the server's
+snapshot cache only reaches the stand-in once every 5 minutes:
+
+    python -m bench.otx_replay serve --dir bench/recordings --latency-ms 200 --jitter-ms 100 --error-rate 0.05
+
+Recordings are stored as gzip-compressed JSON pages. Without recordings, `--synthetic N`
+serves N pulses from the seeded synthetic feed generator instead.
+"""
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+
+import requests
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from dotenv import load_dotenv
+
+from bench.synthetic_feed import generate_pulses
+
+DEFAULT_DIR = Path(__file__).parent / "recordings"
+SUBSCRIBED_PATH = "/api/v1/pulses/subscribed"
+
+
+def record(api_key: str, out_dir: Path, pages: int = 1, limit: int = 100, base_url: str = "https://otx.alienvault.com") -> int:
+    """Fetch `pages` pages of subscribed pulses and store each raw response. Returns pulses saved."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    headers = {"X-OTX-API-KEY": api_key}
+    saved = 0
+    for page in range(1, pages + 1):
+        resp = requests.get(base_url.rstrip("/") + SUBSCRIBED_PATH, headers=headers,
+                            params={"limit": limit, "page": page}, timeout=30)
+        resp.raise_for_status()
+        data = resp.json()
+        with gzip.open(out_dir / f"page-{page:04d}.json.gz", "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        results = data.get("results", []) if isinstance(data, dict) else data
+        saved += len(results)
+        print(f"Recorded page {page}: {len(results)} pulses")
+        if isinstance(data, dict) and not data.get("next"):
+            break
+    return saved
+
+
+def load_recordings(directory: Path) -> List[Dict[str, Any]]:
+    """All recorded pulses, in page order."""
+    pulses: List[Dict[str, Any]] = []
+    for path in sorted(directory.glob("page-*.json.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        pulses.extend(data.get("results", []) if isinstance(data, dict) else data)
+    return pulses
+
+
+def create_app(
+    pulses: List[Dict[str, Any]],
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    max_page_size: int = 100,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """Stand-in for the OTX API serving `pulses` with simulated latency, errors and pagination."""
+    app = FastAPI(title="OTX Replay Server")
+    rng = random.Random(seed)
+
+    @app.get(SUBSCRIBED_PATH)
+    async def subscribed(request: Request, limit: int = 10, page: int = 1):
+        delay = latency_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if error_rate and rng.random() < error_rate:
+            status = rng.choice([429, 500, 502, 503])
+            return JSONResponse({"detail": "Simulated upstream error"}, status_code=status)
+
+        limit = max(1, min(limit, max_page_size))
+        page = max(1, page)
+        start = (page - 1) * limit
+        results = pulses[start:start + limit]
+        base = str(request.url.remove_query_params(["page", "limit"]))
+        has_next = start + limit < len(pulses)
+        return {
+            "results": results,
+            "count": len(pulses),
+            "next": f"{base}?limit={limit}&page={page + 1}" if has_next else None,
+            "previous": f"{base}?limit={limit}&page={page - 1}" if page > 1 else None,
+        }
+
+    return app
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Record and replay OTX pulses for offline load testing")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Capture live pulses/subscribed responses")
+    rec.add_argument("--dir", type=Path, default=DEFAULT_DIR)
+    rec.add_argument("--pages", type=int, default=1)
+    rec.add_argument("--limit", type=int, default=100)
+
+    srv = sub.add_parser("serve", help="Serve recorded (or synthetic) pulses")
+    srv.add_argument("--dir", type=Path, default=DEFAULT_DIR)
+    srv.add_argument("--synthetic", type=int, default=0, help="Serve N synthetic pulses instead of recordings")
+    srv.add_argument("--latency-ms", type=float, default=0.0)
+    srv.add_argument("--jitter-ms", type=float, default=0.0)
+    srv.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/5xx")
+    srv.add_argument("--max-page-size", type=int, default=100)
+    srv.add_argument("--seed", type=int, default=None)
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        api_key = os.getenv("OTX_API_KEY")
+        if not api_key:
+            parser.error("OTX_API_KEY must be set to record")
+        total = record(api_key, args.dir, args.pages, args.limit)
+        print(f"Saved {total} pulses to {args.dir}")
+        return
+
+    if args.synthetic:
+        pulses = generate_pulses(args.synthetic, seed=args.seed or 0)
+    else:
+        pulses = load_recordings(args.dir)
+        if not pulses:
+            parser.error(f"No recordings found in {args.dir} (use 'record' or --synthetic N)")
+
+    import uvicorn
+
+    print(f"Serving {len(pulses)} pulses at http://{args.host}:{args.port}{SUBSCRIBED_PATH}")
+    app = create_app(pulses, args.latency_ms, args.jitter_ms, args.error_rate, args.max_page_size, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
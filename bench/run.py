@@ -0,0 +1,322 @@
+"""Benchmark suite for the scoring/normalization/filtering pipeline and the HTTP endpoints.
+
+Runs against a seeded synthetic feed (see `bench.synthetic_feed`), so results are
+reproducible and comparable across commits:
+
+    python -m bench.run --pulses 500 --indicators 40 --out bench/results/baseline.json
+    python -m bench.run --compare bench/results/baseline.json bench/results/new.json
+"""
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import requests
+
+import mcp_server
+from asset_matching import AssetMatchIndex
+from bench.synthetic_feed import generate_assets, generate_pulses
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], items: int, wall: float) -> Dict[str, Any]:
+    """Latency percentiles in milliseconds plus throughput."""
+    return {
+        "runs": len(latencies),
+        "items_per_run": items,
+        "ops_per_sec": round(len(latencies) / wall, 2) if wall else 0,
+        "items_per_sec": round(len(latencies) * items / wall, 2) if wall else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else 0,
+    }
+
+
+def peak_memory(func: Callable[[], Any], setup: Optional[Callable[[], Any]] = None) -> int:
+    """Peak bytes allocated by one call (measured separately so timing is not skewed)."""
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_function(func: Callable[[], Any], items: int, repeat: int, setup: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """Time `repeat` calls of `func`; `setup`, if given, runs untimed before each call."""
+    if setup:
+        setup()
+    func()  # warm-up
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t0)
+    # With a setup step, throughput counts only the timed calls
+    wall = sum(latencies) if setup else time.perf_counter() - start
+    result = summarize(latencies, items, wall)
+    result["peak_memory_bytes"] = peak_memory(func, setup)
+    return result
+
+
+def run_function_benchmarks(pulses: List[Dict[str, Any]], assets: List[Dict[str, Any]], repeat: int, seed: int) -> Dict[str, Any]:
+    pairs = [(p, ind) for p in pulses for ind in (p.get("indicators") or [{}])]
+    indicators = mcp_server.normalize_pulses_to_indicators(pulses)
+
+    def score_all():
+        for p, ind in pairs:
+            mcp_server.calculate_threat_score(p, ind)
+
+    # What /threats and /stats actually run: one index build per snapshot, then
+    # incremental matching when a single asset is added or removed
+    index = AssetMatchIndex()
+    extra = generate_assets(len(assets) + 1, seed)[-1]
+    with_extra = assets + [extra]
+
+    return {
+        "calculate_threat_score": bench_function(score_all, len(pairs), repeat),
+        "normalize_pulses_to_indicators": bench_function(
+            lambda: mcp_server.normalize_pulses_to_indicators(pulses), len(pulses), repeat),
+        "filter_threats_by_assets": bench_function(
+            lambda: mcp_server.filter_threats_by_assets(indicators, assets), len(indicators), repeat),
+        "AssetMatchIndex build": bench_function(
+            lambda: AssetMatchIndex().relevant(indicators, assets), len(indicators), repeat),
+        "AssetMatchIndex add asset": bench_function(
+            lambda: index.relevant(indicators, with_extra), len(indicators), repeat,
+            setup=lambda: index.relevant(indicators, assets)),
+        "AssetMatchIndex remove asset": bench_function(
+            lambda: index.relevant(indicators, assets), len(indicators), repeat,
+            setup=lambda: index.relevant(indicators, with_extra)),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, assets_file: Path, args: argparse.Namespace) -> subprocess.Popen:
+    """Start `bench.server_process` and wait until it answers."""
+    cmd = [sys.executable, "-m", "bench.server_process", "--port", str(port), "--assets-file", str(assets_file),
+           "--pulses", str(args.pulses), "--indicators", str(args.indicators), "--tags", str(args.tags),
+           "--software", str(args.software), "--seed", str(args.seed), "--snapshot-ttl", str(args.snapshot_ttl)]
+    proc = subprocess.Popen(cmd, cwd=Path(__file__).resolve().parent.parent)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Benchmark server exited with code {proc.returncode}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/metrics", timeout=1)
+            return proc
+        except requests.RequestException:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("Benchmark server did not start within 30s")
+
+
+def _rss_bytes(pid: int) -> int:
+    """Current resident set size of `pid` (Linux /proc; 0 where unavailable)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+class RSSSampler:
+    """Polls a process's RSS in the background and keeps the peak."""
+
+    def __init__(self, pid: int, interval: float = 0.005):
+        self.pid = pid
+        self.interval = interval
+        self.start_bytes = self.peak_bytes = _rss_bytes(pid)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, _rss_bytes(self.pid))
+
+    def __enter__(self) -> "RSSSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, _rss_bytes(self.pid))
+
+
+def bench_endpoint(url: str, requests_total: int, concurrency: int, server_pid: int) -> Dict[str, Any]:
+    local = threading.local()
+
+    def call(_):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        t0 = time.perf_counter()
+        resp = session.get(url, timeout=60)
+        elapsed = time.perf_counter() - t0
+        return elapsed, resp.status_code, len(resp.content)
+
+    with RSSSampler(server_pid) as rss:
+        requests.get(url, timeout=60)  # warm-up (fills the snapshot cache when enabled)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(call, range(requests_total)))
+        wall = time.perf_counter() - start
+
+    latencies = [r[0] for r in results]
+    summary = summarize(latencies, 1, wall)
+    summary["concurrency"] = concurrency
+    summary["errors"] = sum(1 for r in results if r[1] != 200)
+    summary["response_bytes"] = results[-1][2] if results else 0
+    # Server process memory while this endpoint was under load (warm-up included)
+    summary["rss_start_bytes"] = rss.start_bytes
+    summary["peak_rss_bytes"] = rss.peak_bytes
+    return summary
+
+
+def run_endpoint_benchmarks(assets: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    """Load test the server running in its own process on the same synthetic feed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        assets_file = Path(tmp) / "assets.json"
+        assets_file.write_text(json.dumps(assets), encoding="utf-8")
+        port = _free_port()
+        proc = start_server(port, assets_file, args)
+        try:
+            return {
+                "GET /threats": bench_endpoint(f"http://127.0.0.1:{port}/threats", args.requests, args.concurrency, proc.pid),
+                "GET /stats": bench_endpoint(f"http://127.0.0.1:{port}/stats", args.requests, args.concurrency, proc.pid),
+            }
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _peak_rss_bytes() -> int:
+    """Peak RSS of this (load generating) process; endpoint results carry the server's own."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if platform.system() == "Darwin" else rss * 1024
+
+
+def compare(baseline_path: str, candidate_path: str) -> None:
+    """Print p50 latency and throughput changes between two result files."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(candidate_path, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    if baseline["config"] != candidate["config"]:
+        print("Warning: runs used different configurations, deltas may not be meaningful")
+    print(f"{'benchmark':36} {'p50 ms':>20} {'change':>8} {'ops/s':>22} {'change':>8}")
+    for name, new in candidate["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        p50_delta = (new["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0
+        ops_delta = (new["ops_per_sec"] - old["ops_per_sec"]) / old["ops_per_sec"] * 100 if old["ops_per_sec"] else 0
+        print(f"{name:36} {old['p50_ms']:>9} -> {new['p50_ms']:<9} {p50_delta:>+7.1f}% "
+              f"{old['ops_per_sec']:>10} -> {new['ops_per_sec']:<10} {ops_delta:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the MCP CTI pipeline on a synthetic feed")
+    parser.add_argument("--pulses", type=int, default=100)
+    parser.add_argument("--indicators", type=int, default=20, help="Mean indicators per pulse")
+    parser.add_argument("--tags", type=int, default=50, help="Tag cardinality")
+    parser.add_argument("--software", type=int, default=36, help="Distinct software names referenced by pulses")
+    parser.add_argument("--assets", type=int, default=7, help="Assets in the inventory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per function benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint benchmark")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--snapshot-ttl", type=float, default=300.0,
+                        help="Server snapshot TTL during endpoint runs (0 = refetch and normalize every request)")
+    parser.add_argument("--skip-endpoints", action="store_true")
+    parser.add_argument("--out", help="Result file (default: bench/results/<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    pulses = generate_pulses(args.pulses, args.indicators, args.tags, args.software, args.seed)
+    assets = generate_assets(args.assets, args.seed)
+
+    results = run_function_benchmarks(pulses, assets, args.repeat, args.seed)
+    if not args.skip_endpoints:
+        results.update(run_endpoint_benchmarks(assets, args))
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        "dataset": {
+            "pulses": len(pulses),
+            "indicators": sum(len(p["indicators"]) for p in pulses),
+        },
+        "runner_peak_rss_bytes": _peak_rss_bytes(),
+        "results": results,
+    }
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, r in results.items():
+        rss = f"  peak RSS {r['peak_rss_bytes'] / 2**20:.1f} MiB" if "peak_rss_bytes" in r else ""
+        print(f"{name:36} p50 {r['p50_ms']:>9} ms  p99 {r['p99_ms']:>9} ms  {r['ops_per_sec']:>10} ops/s{rss}")
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
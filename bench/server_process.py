@@ -0,0 +1,41 @@
+"""Run the MCP server on a seeded synthetic feed, for `bench.run` to load test out of process.
+
+Started by the benchmark as its own process, so the load-generating threads do not share
+its GIL and its memory can be measured on its own:
+
+    python -m bench.server_process --port 9200 --assets-file /tmp/assets.json --pulses 500
+"""
+import argparse
+import os
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the MCP CTI server on a synthetic feed")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--assets-file", type=Path, required=True)
+    parser.add_argument("--pulses", type=int, default=100)
+    parser.add_argument("--indicators", type=int, default=20)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--software", type=int, default=36)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--snapshot-ttl", type=float, default=300.0)
+    args = parser.parse_args()
+
+    # Never send synthetic pulses to a real LLM or write to the project's summary store
+    os.environ["SUMMARY_BACKEND"] = "off"
+
+    import uvicorn
+
+    import mcp_server
+    from bench.synthetic_feed import generate_pulses
+
+    pulses = generate_pulses(args.pulses, args.indicators, args.tags, args.software, args.seed)
+    mcp_server.fetch_otx_pulses = lambda api_key, limit=50: pulses
+    mcp_server.ASSETS_FILE = args.assets_file
+    mcp_server.SNAPSHOT_TTL = args.snapshot_ttl
+    uvicorn.run(mcp_server.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
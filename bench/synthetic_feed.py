@@ -0,0 +1,179 @@
+"""Seeded generator for realistic OTX-shaped pulses and matching asset inventories.
+
+The same seed and parameters always produce the same feed, so benchmark runs
+are comparable. Usage:
+
+    python -m bench.synthetic_feed --pulses 500 --indicators 40 --out feed.json
+"""
+from typing import Any, Dict, List
+from datetime import datetime, timedelta
+import argparse
+import hashlib
+import json
+import random
+
+SOFTWARE = [
+    "PHP", "MySQL", "WordPress", "Ubuntu", "Nginx", "Python", "PostgreSQL", "Apache", "OpenSSL",
+    "Exchange", "Confluence", "Jenkins", "Tomcat", "Redis", "Elasticsearch", "Kubernetes", "Docker",
+    "Fortinet", "Citrix", "Ivanti", "VMware", "Windows", "Chrome", "Firefox", "Drupal", "Joomla",
+    "MongoDB", "Oracle", "SAP", "Log4j", "Struts", "OpenSSH", "Samba", "Exim", "Zimbra", "GitLab",
+]
+
+BASE_TAGS = [
+    "apt", "ransomware", "phishing", "malware", "botnet", "c2", "exploit", "zero-day", "critical",
+    "exploit-kit", "trojan", "stealer", "loader", "backdoor", "rce", "web", "database", "cms",
+    "plugin", "supply-chain", "credential-theft", "ddos", "cryptominer", "spam", "lazarus", "apt28",
+]
+
+CAMPAIGN_WORDS = ["Campaign", "Activity", "Operation", "Wave", "Cluster", "Intrusion Set"]
+ACTORS = ["APT28", "APT29", "Lazarus", "FIN7", "TA505", "Sandworm", "Kimsuky", "Turla", "unknown actor"]
+
+# Relative frequency of OTX indicator types in a typical subscribed feed
+INDICATOR_TYPES = [
+    ("IPv4", 25), ("domain", 20), ("hostname", 15), ("URL", 15), ("FileHash-SHA256", 10),
+    ("FileHash-MD5", 6), ("FileHash-SHA1", 4), ("CVE", 3), ("email", 2),
+]
+
+
+def _tag_pool(cardinality: int) -> List[str]:
+    tags = list(BASE_TAGS)
+    i = 0
+    while len(tags) < cardinality:
+        tags.append(f"tag-{i}")
+        i += 1
+    return tags[:cardinality]
+
+
+def _software_pool(cardinality: int) -> List[str]:
+    software = list(SOFTWARE)
+    i = 0
+    while len(software) < cardinality:
+        software.append(f"Product{i}")
+        i += 1
+    return software[:cardinality]
+
+
+def generate_assets(asset_count: int = 7, seed: int = 0) -> List[Dict[str, str]]:
+    """Asset inventory in the same shape as assets.json."""
+    rng = random.Random(seed)
+    software = _software_pool(max(asset_count, len(SOFTWARE)))
+    assets = []
+    for name in software[:asset_count]:
+        assets.append({
+            "name": rng.choice(["Web Server", "Database", "CMS", "OS", "Runtime", "Gateway", "Workstation"]),
+            "software": name,
+            "version": f"{rng.randint(1, 20)}.{rng.randint(0, 9)}",
+        })
+    return assets
+
+
+def _indicator_value(rng: random.Random, ind_type: str, software: str) -> str:
+    if ind_type == "IPv4":
+        return ".".join(str(rng.randint(1, 254)) for _ in range(4))
+    if ind_type in ("domain", "hostname"):
+        label = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 12)))
+        prefix = "mail." if ind_type == "hostname" else ""
+        return f"{prefix}{label}.{rng.choice(['com', 'net', 'ru', 'cn', 'xyz', 'top', 'info'])}"
+    if ind_type == "URL":
+        path = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(rng.randint(6, 40)))
+        return f"http://{rng.randint(1, 254)}.{rng.randint(0, 254)}.{rng.randint(0, 254)}.{rng.randint(1, 254)}/{software.lower()}/{path}"
+    if ind_type.startswith("FileHash"):
+        size = {"FileHash-SHA256": 64, "FileHash-SHA1": 40, "FileHash-MD5": 32}[ind_type]
+        return hashlib.sha256(str(rng.random()).encode()).hexdigest()[:size]
+    if ind_type == "CVE":
+        return f"CVE-{rng.randint(2015, 2025)}-{rng.randint(1000, 49999)}"
+    return f"{rng.choice(['admin', 'billing', 'hr', 'support'])}@{rng.choice(['example.com', 'mailbox.ru'])}"
+
+
+def generate_pulses(
+    pulses: int = 100,
+    indicators_per_pulse: int = 20,
+    tag_cardinality: int = 50,
+    asset_cardinality: int = 36,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Generate OTX `pulses/subscribed`-shaped pulses.
+
+    `indicators_per_pulse` is the mean; actual counts vary per pulse (some pulses have
+    none, a few are very large) the way real feeds do. `asset_cardinality` is the number
+    of distinct software names pulses can reference in their names and tags.
+    """
+    rng = random.Random(seed)
+    tags = _tag_pool(tag_cardinality)
+    software = _software_pool(asset_cardinality)
+    type_names = [t for t, _ in INDICATOR_TYPES]
+    type_weights = [w for _, w in INDICATOR_TYPES]
+    now = datetime(2025, 1, 1)
+
+    result: List[Dict[str, Any]] = []
+    for i in range(pulses):
+        target = rng.choice(software)
+        version = f"{rng.randint(1, 20)}.{rng.randint(0, 9)}"
+        created = now - timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86400))
+        modified = created + timedelta(hours=rng.randint(0, 72))
+        pulse_tags = rng.sample(tags, k=min(len(tags), rng.randint(0, 8)))
+        if rng.random() < 0.4:
+            pulse_tags.append(target.lower())
+
+        # Long-tailed size distribution: mostly around the mean, occasional empty or huge pulses
+        roll = rng.random()
+        if roll < 0.05:
+            count = 0
+        elif roll > 0.97:
+            count = indicators_per_pulse * rng.randint(5, 10)
+        else:
+            count = max(1, int(rng.gauss(indicators_per_pulse, indicators_per_pulse / 3)))
+
+        indicators = []
+        for j in range(count):
+            ind_type = rng.choices(type_names, weights=type_weights)[0]
+            indicators.append({
+                "id": i * 100000 + j,
+                "indicator": _indicator_value(rng, ind_type, target),
+                "type": ind_type,
+                "created": created.isoformat(),
+                "title": "",
+                "description": "",
+                "content": "",
+                "is_active": 1,
+            })
+
+        references = [f"https://example.org/report/{i}/{k}" for k in range(rng.randint(0, 6))]
+        result.append({
+            "id": hashlib.md5(f"{seed}-{i}".encode()).hexdigest()[:24],
+            "name": f"{rng.choice(ACTORS)} {rng.choice(CAMPAIGN_WORDS)} targeting {target} {version}",
+            "description": f"Synthetic pulse {i} describing activity against {target}.",
+            "author_name": rng.choice(["AlienVault", "otxuser", "threatfeed-bot"]),
+            "created": created.isoformat(),
+            "modified": modified.isoformat(),
+            "tlp": "white",
+            "public": 1,
+            "adversary": "",
+            "tags": pulse_tags,
+            "references": references,
+            "subscriber_count": int(rng.paretovariate(1.2) * 5),
+            "indicators": indicators,
+        })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic OTX feed")
+    parser.add_argument("--pulses", type=int, default=100)
+    parser.add_argument("--indicators", type=int, default=20, help="Mean indicators per pulse")
+    parser.add_argument("--tags", type=int, default=50, help="Tag cardinality")
+    parser.add_argument("--software", type=int, default=36, help="Distinct software names referenced by pulses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="-", help="Output file ('-' for stdout)")
+    args = parser.parse_args()
+
+    feed = {"results": generate_pulses(args.pulses, args.indicators, args.tags, args.software, args.seed)}
+    if args.out == "-":
+        print(json.dumps(feed))
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(feed, f)
+
+
+if __name__ == "__main__":
+    main()
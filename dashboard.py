@@ -16,6 +16,9 @@ load_dotenv()
 
 API_URL = os.getenv("MCP_API_URL", "http://localhost:9000/threats")
 STATS_URL = os.getenv("MCP_API_URL", "http://localhost:9000/stats").replace("/threats", "/stats")
+CHANGES_URL = os.getenv("MCP_API_URL", "http://localhost:9000/threats").replace("/threats", "/threats/changes")
+SUMMARIES_URL = os.getenv("MCP_API_URL", "http://localhost:9000/threats").replace("/threats", "/summaries")
+ASSETS_RELOAD_URL = os.getenv("MCP_API_URL", "http://localhost:9000/threats").replace("/threats", "/assets/reload")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 ASSETS_FILE = Path("assets.json")
 
@@ -36,10 +39,15 @@ def save_assets(assets):
     try:
         with open(ASSETS_FILE, "w", encoding="utf-8") as f:
             json.dump(assets, f, indent=2)
-        return True
     except Exception as e:
         st.error(f"Failed to save assets: {e}")
         return False
+    # Tell the server to re-match now (it would otherwise notice the file change on its next request)
+    try:
+        requests.post(ASSETS_RELOAD_URL, timeout=5)
+    except Exception:
+        pass
+    return True
 
 
 def fetch_threats(url: str):
@@ -61,6 +69,59 @@ def fetch_stats(url: str):
         return None
 
 
+def fetch_summaries(url: str):
+    try:
+        resp = requests.get(url, timeout=10)
+        resp.raise_for_status()
+        return resp.json()
+    except Exception:
+        return []
+
+
+def fetch_changes(url: str, cursor):
+    try:
+        resp = requests.get(url, params={"cursor": cursor} if cursor else None, timeout=10)
+        resp.raise_for_status()
+        return resp.json()
+    except Exception:
+        return None
+
+
+def update_live_alerts():
+    """Apply high-severity match diffs since the last rerun; returns the newly added threats.
+
+    Only the changes since the stored cursor are transferred, not the full threat list.
+    """
+    alerts = st.session_state.setdefault("live_alerts", {})
+    first_load = "live_cursor" not in st.session_state
+    changes = fetch_changes(CHANGES_URL, st.session_state.get("live_cursor"))
+    if not changes:
+        return []
+
+    def key(t):
+        return (t.get("type"), t.get("value"), t.get("threat_name"))
+
+    new_alerts = []
+    if changes.get("snapshot"):
+        snapshot = changes["snapshot"]
+        previous = set(alerts)
+        alerts.clear()
+        alerts.update({key(t): t for t in snapshot["threats"]})
+        new_alerts = [t for k, t in alerts.items() if k not in previous]
+        st.session_state["live_cursor"] = snapshot["cursor"]
+    for event in changes.get("events", []):
+        for t in event["added"] + event["changed"]:
+            if key(t) not in alerts:
+                new_alerts.append(t)
+            alerts[key(t)] = t
+        for removed in event["removed"]:
+            alerts.pop(key(removed), None)
+        st.session_state["live_cursor"] = event["cursor"]
+
+    # Everything is "new" on the first load; only report what arrived after it
+    return [] if first_load else new_alerts
+
+
 def create_tag_cloud_chart(df):
     """Create a tag cloud visualization."""
     # Safety check for tags column
@@ -258,6 +319,7 @@ def main():
     with st.spinner("Fetching live threat intelligence..."):
         threats = fetch_threats(API_URL)
         stats = fetch_stats(STATS_URL)
+        new_alerts = update_live_alerts()
 
     if not threats:
         st.warning("⚠️ No threats found. Check your OTX API key or asset configuration.")
@@ -322,6 +384,11 @@ def main():
     if len(filtered_df) < len(df):
         st.info(f"🔍 Showing {len(filtered_df)} of {len(df)} threats (filtered)")
     
+    if new_alerts:
+        with st.expander(f"🚨 {len(new_alerts)} new high-severity matches since last refresh", expanded=True):
+            for t in sorted(new_alerts, key=lambda x: x.get("score", 0), reverse=True)[:20]:
+                st.markdown(f"**{t.get('severity')}** ({t.get('score')}) · {t.get('threat_name')} · `{t.get('value')}`")
+    
     # --- TOP METRICS ---
     col1, col2, col3, col4 = st.columns(4)
     
@@ -406,7 +473,7 @@ def main():
     st.divider()
     
     # --- ADVANCED VISUALIZATIONS ---
-    tab1, tab2, tab3 = st.tabs(["📊 Score Analysis", "🏷️ Tag Intelligence", "📅 Timeline"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Score Analysis", "🏷️ Tag Intelligence", "📅 Timeline", "🤖 AI Summaries"])
     
     with tab1:
         col1, col2 = st.columns(2)
@@ -465,6 +532,22 @@ def main():
         else:
             st.info("Timeline data not available")
     
+    with tab4:
+        # Summaries are generated in the background on the server; this only reads the cache
+        asset_summaries = fetch_summaries(SUMMARIES_URL)
+        if not asset_summaries:
+            st.info("No asset summaries available")
+        for entry in asset_summaries:
+            asset = entry["asset"]
+            st.markdown(f"#### 🎯 {asset.get('name', 'Asset')} — {asset.get('software', '')} {asset.get('version', '')}")
+            if not entry["threats"]:
+                st.caption("No matched threats")
+            for t in entry["threats"]:
+                if t.get("summary"):
+                    st.markdown(f"- **{t['threat_name'][:80]}** ({t['severity']}, {t['score']}): {t['summary']}")
+                else:
+                    st.markdown(f"- **{t['threat_name'][:80]}** ({t['severity']}, {t['score']}): _summary {t['status']}_")
+    
     st.divider()
     
     # --- DETAILED THREAT TABLE ---
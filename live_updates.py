@@ -0,0 +1,98 @@
+"""Incremental push of high-severity asset matches to connected clients.
+
+After every snapshot refresh the server publishes the current set of High/Critical
+threats matching the asset inventory. The broker diffs it against the previous set
+and appends one event (`added`, `changed`, `removed`) to a bounded in-memory log.
+Clients resume from the cursor of the last event they saw; a cursor that is unknown
+(server restarted, or too old for the log) gets a full snapshot instead.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+import asyncio
+import threading
+import uuid
+
+HIGH_SEVERITIES = ("High", "Critical")
+
+ThreatKey = Tuple[str, str, str]
+
+
+def threat_key(threat: Dict[str, Any]) -> ThreatKey:
+    return (threat.get("type", ""), threat.get("value", ""), threat.get("threat_name", ""))
+
+
+def _key_dict(key: ThreatKey) -> Dict[str, str]:
+    return {"type": key[0], "value": key[1], "threat_name": key[2]}
+
+
+class UpdateBroker:
+    def __init__(self, max_events: int = 500):
+        # Cursors embed an instance id so cursors from a previous server run are not misread
+        self.instance = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._state: Dict[ThreatKey, Dict[str, Any]] = {}
+        self._events: deque = deque(maxlen=max_events)
+        self._seq = 0
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._waiters)
+
+    def _cursor(self, seq: int) -> str:
+        return f"{self.instance}-{seq}"
+
+    def _parse_cursor(self, cursor: Optional[str]) -> Optional[int]:
+        instance, _, seq = (cursor or "").rpartition("-")
+        if instance != self.instance or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, threats: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Diff `threats` against the last published set; returns the new event, if any."""
+        current = {threat_key(t): t for t in threats if t.get("severity") in HIGH_SEVERITIES}
+        with self._lock:
+            added = [t for k, t in current.items() if k not in self._state]
+            changed = [t for k, t in current.items() if k in self._state and self._state[k] != t]
+            removed = [_key_dict(k) for k in self._state if k not in current]
+            self._state = current
+            if not (added or changed or removed):
+                return None
+            self._seq += 1
+            event = {
+                "cursor": self._cursor(self._seq),
+                "added": added,
+                "changed": changed,
+                "removed": removed,
+            }
+            self._events.append((self._seq, event))
+            waiters = list(self._waiters)
+
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(waiter.set)
+        return event
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"cursor": self._cursor(self._seq), "threats": list(self._state.values())}
+
+    def events_since(self, cursor: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """Events after `cursor`, or None when the client must resync from a snapshot."""
+        seq = self._parse_cursor(cursor)
+        with self._lock:
+            if seq is None or seq > self._seq:
+                return None
+            oldest = self._events[0][0] if self._events else self._seq + 1
+            if seq < oldest - 1:
+                return None  # Events the client missed were already evicted
+            return [event for s, event in self._events if s > seq]
+
+    def subscribe(self) -> asyncio.Event:
+        waiter = asyncio.Event()
+        with self._lock:
+            self._waiters.append((asyncio.get_running_loop(), waiter))
+        return waiter
+
+    def unsubscribe(self, waiter: asyncio.Event) -> None:
+        with self._lock:
+            self._waiters = [(loop, w) for loop, w in self._waiters if w is not waiter]
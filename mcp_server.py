@@ -4,17 +4,47 @@ import json
 from pathlib import Path
 from datetime import datetime
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import threading
+import time
 
 import requests
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
+import metrics
+import profiling
+import summaries
+from asset_matching import AssetMatchIndex, asset_key
+from live_updates import HIGH_SEVERITIES, UpdateBroker
+from sources import Source, parse_sources_config
+
 load_dotenv()
 
 OTX_API_KEY = os.getenv("OTX_API_KEY")
+# Point at a local stand-in (see bench/otx_replay.py) for offline load testing
+DEFAULT_OTX_BASE_URL = "https://otx.alienvault.com"
+OTX_BASE_URL = os.getenv("OTX_BASE_URL", DEFAULT_OTX_BASE_URL).rstrip("/")
+OTX_TIMEOUT = float(os.getenv("OTX_TIMEOUT_SECONDS", "10"))
+# How long a fetched+normalized snapshot is reused before OTX is queried again
+SNAPSHOT_TTL = float(os.getenv("SNAPSHOT_TTL_SECONDS", "300"))
+# After a refresh that got no indicators, retry sooner than the full TTL
+SNAPSHOT_RETRY = float(os.getenv("SNAPSHOT_RETRY_SECONDS", "30"))
 BASE_DIR = Path(__file__).parent
 ASSETS_FILE = BASE_DIR / "assets.json"
+# Extra local feeds ingested alongside OTX, e.g. "stix:feeds/bundle.json,csv:feeds/iocs.csv"
+CTI_SOURCES = os.getenv("CTI_SOURCES", "")
+# "thread" or "process"; use processes when large local files make parsing CPU-bound
+INGEST_EXECUTOR = os.getenv("INGEST_EXECUTOR", "thread")
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+# Seconds between keep-alive comments on idle /threats/stream connections
+STREAM_HEARTBEAT = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
 
 
 class Threat(BaseModel):
@@ -26,6 +56,7 @@ class Threat(BaseModel):
     score: float
     tags: Optional[List[str]] = []
     created: Optional[str] = None
+    modified: Optional[str] = None
     references: Optional[int] = 0
 
 
@@ -36,29 +67,27 @@ SAMPLE_THREATS = [
 ]
 
 
-def get_otx_pulses(api_key: str, limit: int = 50) -> List[Dict[str, Any]]:
-    """Fetch recent pulses from AlienVault OTX. If the API call fails, return an empty list.
+def fetch_otx_pulses(api_key: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """Fetch recent pulses from AlienVault OTX, raising on API errors.
 
-    This is intentionally minimal for educational purposes.
+    This is intentionally minimal for educational purposes. Errors are counted by
+    ingest_sources, which also keeps the last good batch while OTX is failing.
     """
-    if not api_key:
+    # A local stand-in (OTX_BASE_URL overridden) needs no real key
+    if not api_key and OTX_BASE_URL == DEFAULT_OTX_BASE_URL:
         return []
 
-    url = "https://otx.alienvault.com/api/v1/pulses/subscribed"
-    headers = {"X-OTX-API-KEY": api_key}
+    url = f"{OTX_BASE_URL}/api/v1/pulses/subscribed"
+    headers = {"X-OTX-API-KEY": api_key or ""}
     params = {"limit": limit, "page": 1}
-    try:
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, dict) and "results" in data:
-            return data["results"]
-        if isinstance(data, list):
-            return data
-        return []
-    except Exception as e:
-        print(f"OTX API Error: {e}")
-        return []
+    resp = requests.get(url, headers=headers, params=params, timeout=OTX_TIMEOUT)
+    resp.raise_for_status()
+    data = resp.json()
+    if isinstance(data, dict) and "results" in data:
+        return data["results"]
+    if isinstance(data, list):
+        return data
+    return []
 
 
 def calculate_threat_score(pulse: Dict[str, Any], indicator: Dict[str, Any]) -> float:
@@ -111,12 +140,15 @@ def determine_severity(score: float) -> str:
         return "Low"
 
 
-def normalize_pulses_to_indicators(pulses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def normalize_pulses_to_indicators(pulses: List[Dict[str, Any]], source: str = "otx") -> List[Dict[str, Any]]:
     normalized: List[Dict[str, Any]] = []
     
     for p in pulses:
         name = p.get("name") or "unknown"
         created = p.get("created") or p.get("modified") or datetime.now().isoformat()
+        # Upstream last-change time as published (None when the feed has no dates)
+        modified = p.get("modified") or p.get("created")
+        modified = str(modified) if modified else None
         tags = p.get("tags", []) or []
         references = p.get("subscriber_count", 0) or p.get("references", 0) or 0
         # Handle if references is a list
@@ -138,11 +170,12 @@ def normalize_pulses_to_indicators(pulses: List[Dict[str, Any]]) -> List[Dict[st
                 "type": ind_type,
                 "value": value[:100],  # Truncate long values
                 "threat_name": name[:150],
-                "source": "otx",
+                "source": source,
                 "severity": severity,
                 "score": score,
                 "tags": tags[:5],  # Limit tags
                 "created": created.split("T")[0] if "T" in created else created,
+                "modified": modified,
                 "references": references
             })
         
@@ -154,25 +187,45 @@ def normalize_pulses_to_indicators(pulses: List[Dict[str, Any]]) -> List[Dict[st
                 "type": "pulse",
                 "value": name[:100],
                 "threat_name": name[:150],
-                "source": "otx",
+                "source": source,
                 "severity": severity,
                 "score": score,
                 "tags": tags[:5],
                 "created": created.split("T")[0] if "T" in created else created,
+                "modified": modified,
                 "references": references
             })
     
     return normalized
 
 
+# Parsed assets.json, re-read only when its mtime/size changes or on reload_assets()
+_assets_cache: Dict[str, Any] = {"stamp": None, "assets": [], "version": 0}
+_assets_lock = threading.Lock()
+
+
 def load_assets() -> List[Dict[str, Any]]:
-    if not ASSETS_FILE.exists():
-        return []
     try:
-        with open(ASSETS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
+        stat = ASSETS_FILE.stat()
+    except OSError:
         return []
+    stamp = (str(ASSETS_FILE), stat.st_mtime_ns, stat.st_size)
+    with _assets_lock:
+        if stamp != _assets_cache["stamp"]:
+            try:
+                with open(ASSETS_FILE, "r", encoding="utf-8") as f:
+                    assets = json.load(f)
+            except Exception:
+                assets = []
+            _assets_cache.update(stamp=stamp, assets=assets, version=_assets_cache["version"] + 1)
+        return _assets_cache["assets"]
+
+
+def reload_assets() -> List[Dict[str, Any]]:
+    """Drop the cached assets so the next load re-reads assets.json."""
+    with _assets_lock:
+        _assets_cache["stamp"] = None
+    return load_assets()
 
 
 def filter_threats_by_assets(threats: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -213,45 +266,398 @@ def filter_threats_by_assets(threats: List[Dict[str, Any]], assets: List[Dict[st
     return filtered
 
 
-app = FastAPI(title="MCP CTI Server")
+# refreshed_at: last successful refresh (drives the age metric); checked_at: last attempt (drives the TTL)
+_snapshot: Dict[str, Any] = {"indicators": None, "refreshed_at": None, "checked_at": None, "ok": False}
+_snapshot_lock = threading.Lock()
 
 
-@app.get("/threats", response_model=List[Threat])
-def get_threats():
-    """Get threats filtered by assets."""
-    pulses = get_otx_pulses(OTX_API_KEY, limit=100)
-    if pulses:
-        indicators = normalize_pulses_to_indicators(pulses)
+def _snapshot_age() -> float:
+    refreshed_at = _snapshot["refreshed_at"]
+    return time.monotonic() - refreshed_at if refreshed_at is not None else float("nan")
+
+
+metrics.SNAPSHOT_AGE.set_function(_snapshot_age)
+
+
+def _snapshot_fresh() -> bool:
+    checked_at = _snapshot["checked_at"]
+    if _snapshot["indicators"] is None or checked_at is None:
+        return False
+    ttl = SNAPSHOT_TTL if _snapshot["ok"] else min(SNAPSHOT_RETRY, SNAPSHOT_TTL)
+    return time.monotonic() - checked_at < ttl
+
+
+class OTXSource(Source):
+    kind = "otx"
+
+    def __init__(self, api_key: Optional[str], limit: int = 100):
+        super().__init__()
+        self.api_key = api_key
+        self.limit = limit
+
+    def fetch_pulses(self) -> List[Dict[str, Any]]:
+        # Raises, so errors reach the parent even when ingest runs in a process pool
+        return fetch_otx_pulses(self.api_key, limit=self.limit)
+
+
+def configured_sources() -> List[Source]:
+    """OTX plus any local feeds listed in CTI_SOURCES."""
+    configured: List[Source] = [OTXSource(OTX_API_KEY, limit=100)]
+    try:
+        configured.extend(parse_sources_config(CTI_SOURCES, BASE_DIR))
+    except ValueError as e:
+        print(f"CTI_SOURCES Error: {e}")
+    return configured
+
+
+def fetch_source(source: Source) -> Dict[str, Any]:
+    """Fetch and normalize one source. Runs in a pool worker, so timings are returned, not recorded."""
+    result: Dict[str, Any] = {"name": source.name, "indicators": [], "error": None}
+    start = time.perf_counter()
+    try:
+        pulses = source.fetch_pulses()
+        result["fetch_seconds"] = time.perf_counter() - start
+        start = time.perf_counter()
+        result["indicators"] = normalize_pulses_to_indicators(pulses, source=source.kind)
+        result["normalize_seconds"] = time.perf_counter() - start
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def merge_indicators(batches: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Concatenate per-source indicators, dropping exact repeats of (type, value, threat name)."""
+    merged: List[Dict[str, Any]] = []
+    seen = set()
+    for batch in batches:
+        for ind in batch:
+            key = (ind["type"], ind["value"], ind["threat_name"])
+            if key not in seen:
+                seen.add(key)
+                merged.append(ind)
+    return merged
+
+
+# Last successful batch per source, reused while that source is failing
+_last_good_batches: Dict[str, List[Dict[str, Any]]] = {}
+
+
+def ingest_sources(source_list: List[Source]) -> Dict[str, List[Dict[str, Any]]]:
+    """Fetch and normalize all sources in parallel; total time is bounded by the slowest one.
+
+    Returns normalized indicators per source name, in source order. A source that
+    fails contributes its last good batch, if it ever had one.
+    """
+    if len(source_list) == 1:
+        results = [fetch_source(source_list[0])]
     else:
+        pool_class = ProcessPoolExecutor if INGEST_EXECUTOR == "process" else ThreadPoolExecutor
+        with pool_class(max_workers=min(INGEST_WORKERS, len(source_list))) as pool:
+            results = list(pool.map(fetch_source, source_list))
+
+    per_source: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        name = result["name"]
+        if result["error"]:
+            metrics.UPSTREAM_ERRORS.inc(source=name)
+            print(f"Source Error ({name}): {result['error']}")
+            result["indicators"] = _last_good_batches.get(name, [])
+        else:
+            _last_good_batches[name] = result["indicators"]
+        if "fetch_seconds" in result:
+            metrics.STAGE_DURATION.observe(result["fetch_seconds"], stage=f"{name}_fetch")
+        if "normalize_seconds" in result:
+            metrics.STAGE_DURATION.observe(result["normalize_seconds"], stage=f"{name}_normalize")
+        per_source[name] = result["indicators"]
+    return per_source
+
+
+def refresh_snapshot() -> List[Dict[str, Any]]:
+    """Ingest all configured sources, replacing the cached snapshot.
+
+    A refresh that yields no indicators keeps the last good snapshot; SAMPLE_THREATS
+    is only served when nothing has ever loaded.
+    """
+    with metrics.time_stage("ingest"):
+        per_source = ingest_sources(configured_sources())
+    with metrics.time_stage("merge"):
+        indicators = merge_indicators(list(per_source.values()))
+
+    _snapshot["checked_at"] = time.monotonic()
+    _snapshot["ok"] = bool(indicators)
+    if not indicators:
+        metrics.REFRESH_FAILURES.inc()
+        if _snapshot["refreshed_at"] is not None:
+            print("Snapshot refresh returned no indicators, keeping the last good snapshot")
+            return _snapshot["indicators"]
         indicators = SAMPLE_THREATS
 
+    counts = {name: len(batch) for name, batch in per_source.items()}
+    counts["sample"] = len(indicators) if indicators is SAMPLE_THREATS else 0
+
+    _snapshot["indicators"] = indicators
+    if indicators is not SAMPLE_THREATS:
+        _snapshot["refreshed_at"] = _snapshot["checked_at"]
+    for origin, count in counts.items():
+        metrics.SNAPSHOT_INDICATORS.set(count, origin=origin)
+
+    with metrics.time_stage("publish"):
+        publish_matches(indicators)
+    return indicators
+
+
+broker = UpdateBroker()
+metrics.STREAM_SUBSCRIBERS.set_function(lambda: broker.subscribers)
+
+
+asset_index = AssetMatchIndex()
+_published = {"assets_version": None}
+
+
+def publish_matches(indicators: List[Dict[str, Any]]) -> None:
+    """Push the diff of High/Critical asset matches to live update subscribers.
+
+    Callers hold _snapshot_lock and pass the current snapshot, so a stale list can
+    never overwrite newer state in the broker.
+    """
     assets = load_assets()
-    if assets:
-        relevant = filter_threats_by_assets(indicators, assets)
-    else:
-        relevant = indicators[:50]  # Limit to 50 if no filtering
+    _published["assets_version"] = _assets_cache["version"]
+    if indicators is SAMPLE_THREATS:
+        return  # Placeholder data, not a real match set
+    matches = asset_index.relevant(indicators, assets)
+    broker.publish([t for t in matches if t.get("severity") in HIGH_SEVERITIES])
+    schedule_summaries(indicators, assets)
 
-    # Sort by score descending
-    relevant.sort(key=lambda x: x.get("score", 0), reverse=True)
-    
-    return relevant[:100]  # Return top 100
+
+_summary_service: Optional[summaries.SummaryService] = None
+_summary_lock = threading.Lock()
+_catalog = {"indicators": None, "catalog": None}
+_catalog_lock = threading.Lock()
+
+
+def get_summary_service() -> summaries.SummaryService:
+    """Created on first use so the store and model are only set up when summaries are needed."""
+    global _summary_service
+    with _summary_lock:
+        if _summary_service is None:
+            _summary_service = summaries.SummaryService(
+                summaries.SummaryStore(), summaries.default_model(), select_summary_pulses)
+            metrics.SUMMARY_PENDING.set_function(lambda: _summary_service.pending)
+        return _summary_service
+
+
+def get_pulse_catalog(indicators: List[Dict[str, Any]]) -> summaries.PulseCatalog:
+    """Pulse catalog for a snapshot, built once per snapshot."""
+    with _catalog_lock:
+        if _catalog["indicators"] is not indicators:
+            _catalog["catalog"] = summaries.PulseCatalog(indicators)
+            _catalog["indicators"] = indicators
+        return _catalog["catalog"]
+
+
+def top_pulses_per_asset(indicators: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Top SUMMARY_TOP_N matched pulses per asset, as (content hash, pulse) pairs."""
+    if not assets:
+        return []
+    matched = asset_index.per_asset(indicators, assets)
+    catalog = get_pulse_catalog(indicators)
+    return [{"asset": asset, "pulses": catalog.top(matched.get(asset_key(asset), []))} for asset in assets]
+
+
+def select_summary_pulses(indicators: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> List[tuple]:
+    """Runs on the summary worker thread."""
+    return [pair for entry in top_pulses_per_asset(indicators, assets) for pair in entry["pulses"]]
+
+
+def schedule_summaries(indicators: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> None:
+    """Hand the snapshot to the summary worker; selection and hashing happen there."""
+    if not summaries.summaries_enabled() or not assets:
+        return
+    try:
+        get_summary_service().submit(indicators, assets)
+    except Exception as e:
+        print(f"Summary scheduling error: {e}")
+
+
+def get_indicators() -> List[Dict[str, Any]]:
+    """Return the normalized indicator snapshot, refreshing it once it is older than SNAPSHOT_TTL."""
+    with _snapshot_lock:
+        if _snapshot_fresh() and not profiling.force_refresh():
+            metrics.CACHE_REQUESTS.inc(result="hit")
+            return _snapshot["indicators"]
+        metrics.CACHE_REQUESTS.inc(result="miss")
+        return refresh_snapshot()
+
+
+def publish_current_snapshot() -> None:
+    """Re-publish matches for the current snapshot (after asset edits)."""
+    with _snapshot_lock:
+        if _snapshot["indicators"] is not None:
+            with metrics.time_stage("publish"):
+                publish_matches(_snapshot["indicators"])
+
+
+def get_relevant_threats() -> List[Dict[str, Any]]:
+    indicators = get_indicators()
+
+    assets = load_assets()
+    with metrics.time_stage("filter"):
+        if assets:
+            # Incremental equivalent of filter_threats_by_assets(indicators, assets)
+            relevant = asset_index.relevant(indicators, assets)
+        else:
+            relevant = indicators[:50]  # Limit to 50 if no filtering
+    metrics.RELEVANT_THREATS.set(len(relevant))
+
+    if _published["assets_version"] != _assets_cache["version"]:
+        # Asset edits change the match set without a snapshot refresh
+        publish_current_snapshot()
+    return relevant
+
+
+async def refresh_for_subscribers():
+    """Keep the snapshot fresh while stream clients are connected, so they all share one refresh."""
+    while True:
+        await asyncio.sleep(1)
+        if broker.subscribers and not _snapshot_fresh():
+            try:
+                await run_in_threadpool(get_indicators)
+            except Exception as e:
+                print(f"Background refresh error: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(refresh_for_subscribers())
+    yield
+    task.cancel()
+
+
+app = FastAPI(title="MCP CTI Server", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def profile_middleware(request: Request, call_next):
+    tokens = profiling.mark_request(request.headers)
+    try:
+        return await call_next(request)
+    finally:
+        profiling.unmark_request(tokens)
+
+
+@app.get("/threats", response_model=List[Threat])
+@profiling.profiled("threats")
+def get_threats():
+    """Get threats filtered by assets."""
+    with metrics.REQUEST_DURATION.time(endpoint="/threats"):
+        relevant = get_relevant_threats()
+
+        # Sort by score descending (on a copy, the snapshot is shared between requests)
+        with metrics.time_stage("sort"):
+            relevant = sorted(relevant, key=lambda x: x.get("score", 0), reverse=True)
+
+        with metrics.time_stage("serialize"):
+            body = jsonable_encoder([Threat(**t) for t in relevant[:100]])  # Return top 100
+        return JSONResponse(body)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"id: {data['cursor']}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/threats/stream")
+async def stream_threats(request: Request, cursor: Optional[str] = None, last_event_id: Optional[str] = Header(None)):
+    """Server-sent events with High/Critical asset matches that changed since `cursor`.
+
+    Without a usable cursor (or `Last-Event-ID` on reconnect) the stream starts with a
+    `snapshot` event holding the full current set; after that only `update` diffs are sent.
+    """
+    cursor = cursor or last_event_id
+
+    async def events():
+        nonlocal cursor
+        # Subscribed inside the generator so the finally below always unsubscribes
+        waiter = broker.subscribe()
+        try:
+            if _snapshot["indicators"] is None:
+                await run_in_threadpool(get_indicators)
+            pending = broker.events_since(cursor)
+            if pending is None:
+                snapshot = broker.snapshot()
+                cursor = snapshot["cursor"]
+                yield _sse("snapshot", snapshot)
+                pending = broker.events_since(cursor) or []
+            while True:
+                for event in pending:
+                    cursor = event["cursor"]
+                    yield _sse("update", event)
+                if await request.is_disconnected():
+                    break
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                waiter.clear()
+                pending = broker.events_since(cursor)
+                if pending is None:
+                    # Fell too far behind the event log; resync
+                    snapshot = broker.snapshot()
+                    cursor = snapshot["cursor"]
+                    yield _sse("snapshot", snapshot)
+                    pending = []
+        finally:
+            broker.unsubscribe(waiter)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/threats/changes")
+def get_threat_changes(cursor: Optional[str] = None):
+    """Polling fallback for the stream: update events since `cursor`, or a snapshot to resync from."""
+    get_indicators()
+    events = broker.events_since(cursor)
+    if events is None:
+        return {"snapshot": broker.snapshot(), "events": []}
+    return {"snapshot": None, "events": events}
+
+
+@app.post("/assets/reload")
+def post_assets_reload():
+    """Reload signal after assets.json is edited (e.g. by the dashboard)."""
+    assets = reload_assets()
+    publish_current_snapshot()
+    return {"assets": len(assets)}
+
+
+@app.get("/summaries")
+def get_summaries():
+    """Top matched pulses per asset with their cached summaries (status "pending" while generating)."""
+    indicators = get_indicators()
+    assets = load_assets()
+    enabled = summaries.summaries_enabled()
+    result = []
+    for entry in top_pulses_per_asset(indicators, assets):
+        if enabled:
+            threats = get_summary_service().lookup(entry["pulses"])
+        else:
+            threats = [{**p, "hash": h, "summary": None, "status": "disabled"} for h, p in entry["pulses"]]
+        result.append({"asset": entry["asset"], "threats": threats})
+    return result
 
 
 @app.get("/stats")
+@profiling.profiled("stats")
 def get_stats():
     """Get threat statistics."""
-    pulses = get_otx_pulses(OTX_API_KEY, limit=100)
-    if pulses:
-        indicators = normalize_pulses_to_indicators(pulses)
-    else:
-        indicators = SAMPLE_THREATS
-    
-    assets = load_assets()
-    if assets:
-        relevant = filter_threats_by_assets(indicators, assets)
-    else:
-        relevant = indicators[:50]
-    
+    with metrics.REQUEST_DURATION.time(endpoint="/stats"):
+        relevant = get_relevant_threats()
+
+        with metrics.time_stage("aggregate"):
+            stats = compute_stats(relevant)
+        return stats
+
+
+def compute_stats(relevant: List[Dict[str, Any]]) -> Dict[str, Any]:
     # Calculate stats
     severity_counts = {}
     type_counts = {}
@@ -281,3 +687,35 @@ def get_stats():
         "avg_score": round(sum(t.get("score", 0) for t in relevant) / len(relevant), 2) if relevant else 0,
         "critical_count": severity_counts.get("Critical", 0)
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus scrape endpoint."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def _require_admin(token: Optional[str]) -> None:
+    if not profiling.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not profiling.is_admin(token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.get("/admin/profiles", include_in_schema=False)
+def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """List captured request profiles, newest first."""
+    _require_admin(x_admin_token)
+    return profiling.list_profiles()
+
+
+@app.get("/admin/profiles/{name}", include_in_schema=False)
+def download_profile(name: str, format: str = "prof", x_admin_token: Optional[str] = Header(None)):
+    """Download a raw .prof file, or a pstats text summary with ?format=text."""
+    _require_admin(x_admin_token)
+    path = profiling.get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(profiling.profile_summary(path))
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
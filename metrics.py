@@ -0,0 +1,197 @@
+"""Minimal Prometheus-style metrics for the MCP CTI server.
+
+Only what the server needs: labelled counters, gauges and histograms rendered in
+the Prometheus text exposition format. Kept dependency-free and cheap enough
+(a lock and a bisect per observation) to leave enabled in production.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+
+
+# Stage latencies are mostly sub-second, upstream fetches can take up to the 10s timeout
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Gauge whose value is either set explicitly or computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v), self._sums[k]) for k, v in self._counts.items())
+        lines: List[str] = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "cti_stage_duration_seconds", "Time spent in each ingest/query pipeline stage.", ("stage",)))
+REQUEST_DURATION = REGISTRY.register(Histogram(
+    "cti_request_duration_seconds", "End-to-end handler time per endpoint.", ("endpoint",)))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cti_snapshot_cache_total", "Indicator snapshot lookups by result (hit or miss).", ("result",)))
+UPSTREAM_ERRORS = REGISTRY.register(Counter(
+    "cti_upstream_errors_total", "Failed requests to upstream threat feeds.", ("source",)))
+REFRESH_FAILURES = REGISTRY.register(Counter(
+    "cti_snapshot_refresh_failures_total", "Snapshot refreshes that got no indicators from any source."))
+SNAPSHOT_AGE = REGISTRY.register(Gauge(
+    "cti_snapshot_age_seconds", "Seconds since the indicator snapshot was last refreshed."))
+SNAPSHOT_INDICATORS = REGISTRY.register(Gauge(
+    "cti_snapshot_indicators", "Indicators in the current snapshot, by origin.", ("origin",)))
+RELEVANT_THREATS = REGISTRY.register(Gauge(
+    "cti_relevant_threats", "Threats matched against assets on the last query."))
+STREAM_SUBSCRIBERS = REGISTRY.register(Gauge(
+    "cti_stream_subscribers", "Clients connected to the live threat update stream."))
+SUMMARY_CACHE = REGISTRY.register(Counter(
+    "cti_summary_cache_total", "Threat summary lookups by result (hit or miss).", ("result",)))
+SUMMARY_BATCHES = REGISTRY.register(Counter(
+    "cti_summary_batches_total", "Background summarization batches by result.", ("result",)))
+SUMMARY_PENDING = REGISTRY.register(Gauge(
+    "cti_summary_pending", "Pulses queued for background summarization."))
+
+
+def time_stage(stage: str):
+    """Context manager recording the duration of one pipeline stage."""
+    return STAGE_DURATION.time(stage=stage)
+
+
+def render() -> str:
+    return REGISTRY.render()
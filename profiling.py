@@ -0,0 +1,145 @@
+"""Opt-in per-request cProfile capture for the MCP CTI server.
+
+A request is profiled when either:
+- it is picked by random sampling (PROFILE_SAMPLE_RATE, 0.0-1.0, default 0 = off), or
+- it carries `X-Profile: 1` together with a valid `X-Admin-Token` (requires ADMIN_TOKEN).
+  `X-Profile: refresh` additionally bypasses the snapshot cache so the OTX fetch and
+  normalization stages show up in the profile.
+
+Profiles are written as `.prof` files (loadable with `pstats`/snakeviz) into PROFILE_DIR,
+which is kept as a ring buffer of at most PROFILE_MAX_FILES files.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+import cProfile
+import functools
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+
+BASE_DIR = Path(__file__).parent
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles")))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+PROFILE_NAME_RE = re.compile(r"^[\w.-]+\.prof$")
+
+# Set by the middleware for requests that should be profiled; copied into the
+# threadpool worker that runs the (sync) endpoint.
+_profile_request: ContextVar[bool] = ContextVar("profile_request", default=False)
+_force_refresh: ContextVar[bool] = ContextVar("profile_force_refresh", default=False)
+
+# cProfile can only have one active profiler per process on Python 3.12+,
+# so concurrent profiled requests are skipped instead of failing.
+_profiler_lock = threading.Lock()
+_ring_lock = threading.Lock()
+
+
+def is_admin(token: Optional[str]) -> bool:
+    # Constant-time comparison, so response timing does not leak the token
+    if not ADMIN_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def should_profile(headers: Dict[str, str]) -> bool:
+    """Decide whether the incoming request should be profiled."""
+    if headers.get("x-profile") in ("1", "refresh") and is_admin(headers.get("x-admin-token")):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def mark_request(headers: Dict[str, str]):
+    """Flag the current request context for profiling; returns tokens for `unmark_request`."""
+    enabled = should_profile(headers)
+    refresh = enabled and headers.get("x-profile") == "refresh"
+    return _profile_request.set(enabled), _force_refresh.set(refresh)
+
+
+def unmark_request(tokens) -> None:
+    _profile_request.reset(tokens[0])
+    _force_refresh.reset(tokens[1])
+
+
+def force_refresh() -> bool:
+    """True when the current profiled request asked to bypass the snapshot cache."""
+    return _force_refresh.get()
+
+
+def profiled(label: str) -> Callable:
+    """Decorator profiling the wrapped endpoint when the current request is marked."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _profile_request.get() or not _profiler_lock.acquire(blocking=False):
+                return func(*args, **kwargs)
+            try:
+                profiler = cProfile.Profile()
+                start = time.perf_counter()
+                profiler.enable()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profiler.disable()
+                    save_profile(profiler, label, time.perf_counter() - start)
+            finally:
+                _profiler_lock.release()
+        return wrapper
+    return decorator
+
+
+def save_profile(profiler: cProfile.Profile, label: str, duration: float) -> Optional[Path]:
+    """Dump a profile into the ring buffer, evicting the oldest files over the limit."""
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        safe_label = re.sub(r"[^\w-]", "_", label.strip("/")) or "root"
+        path = PROFILE_DIR / f"{stamp}-{safe_label}-{int(duration * 1000)}ms.prof"
+        profiler.dump_stats(str(path))
+        with _ring_lock:
+            files = sorted(PROFILE_DIR.glob("*.prof"))
+            for old in files[:max(len(files) - PROFILE_MAX_FILES, 0)]:
+                old.unlink(missing_ok=True)
+        return path
+    except Exception as e:
+        print(f"Profile save error: {e}")
+        return None
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Newest-first listing of stored profiles."""
+    if not PROFILE_DIR.exists():
+        return []
+    profiles = []
+    for path in sorted(PROFILE_DIR.glob("*.prof"), reverse=True):
+        stat = path.stat()
+        profiles.append({
+            "name": path.name,
+            "size": stat.st_size,
+            "created": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+        })
+    return profiles
+
+
+def get_profile_path(name: str) -> Optional[Path]:
+    """Resolve a profile name from the listing; None for unknown or unsafe names."""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = PROFILE_DIR / name
+    return path if path.is_file() else None
+
+
+def profile_summary(path: Path, limit: int = 30) -> str:
+    """Human-readable top functions by cumulative time."""
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,293 @@
+"""Pluggable threat-intel sources for the ingest pipeline.
+
+Every source turns its native format into OTX-shaped pulses
+(`name`, `tags`, `created`, `references`, `indicators: [{type, indicator}]`), so that
+`normalize_pulses_to_indicators` in mcp_server.py scores and normalizes all of them
+the same way. Sources are plain picklable objects so they can run in a process pool.
+
+Local sources are configured with CTI_SOURCES, a comma-separated list of `kind:path`:
+
+    CTI_SOURCES=stix:feeds/bundle.json,misp:feeds/misp_export.json,csv:feeds/iocs.csv
+"""
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+import csv
+import json
+import re
+
+
+class Source:
+    """Base class: subclasses set `kind` and implement `fetch_pulses`."""
+
+    kind = "source"
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or self.kind
+
+    def fetch_pulses(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class FileSource(Source):
+    def __init__(self, path: str, name: Optional[str] = None):
+        self.path = Path(path)
+        super().__init__(name or f"{self.kind}:{self.path.name}")
+
+
+def infer_indicator_type(value: str) -> str:
+    """Best-effort OTX indicator type for a bare IOC value."""
+    v = value.strip()
+    if re.fullmatch(r"CVE-\d{4}-\d{4,}", v, re.IGNORECASE):
+        return "CVE"
+    if re.fullmatch(r"\d{1,3}(\.\d{1,3}){3}(/\d{1,2})?", v):
+        return "IPv4"
+    if ":" in v and re.fullmatch(r"[0-9a-fA-F:]+(/\d{1,3})?", v):
+        return "IPv6"
+    if re.fullmatch(r"[0-9a-fA-F]{64}", v):
+        return "FileHash-SHA256"
+    if re.fullmatch(r"[0-9a-fA-F]{40}", v):
+        return "FileHash-SHA1"
+    if re.fullmatch(r"[0-9a-fA-F]{32}", v):
+        return "FileHash-MD5"
+    if re.match(r"[a-z][a-z0-9+.-]*://", v, re.IGNORECASE):
+        return "URL"
+    if re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", v):
+        return "email"
+    if re.fullmatch(r"([a-z0-9-]+\.)+[a-z]{2,}", v, re.IGNORECASE):
+        return "domain"
+    return "indicator"
+
+
+# --- STIX 2.1 ---
+
+STIX_OBJECT_TYPES = {
+    "ipv4-addr": "IPv4",
+    "ipv6-addr": "IPv6",
+    "domain-name": "domain",
+    "url": "URL",
+    "email-addr": "email",
+    "mutex": "Mutex",
+}
+STIX_HASH_TYPES = {"SHA-256": "FileHash-SHA256", "SHA-1": "FileHash-SHA1", "MD5": "FileHash-MD5"}
+STIX_COMPARISON_RE = re.compile(r"([a-z0-9-]+):([^\s=]+)\s*=\s*'((?:[^'\\]|\\.)*)'")
+
+
+def parse_stix_pattern(pattern: str) -> List[Dict[str, str]]:
+    """Extract equality comparisons from a STIX pattern as OTX-style indicators."""
+    indicators = []
+    for obj_type, prop, value in STIX_COMPARISON_RE.findall(pattern or ""):
+        value = value.replace("\\'", "'").replace("\\\\", "\\")
+        if obj_type == "file" and prop.startswith("hashes."):
+            ind_type = STIX_HASH_TYPES.get(prop.split(".", 1)[1].strip("'\""), "FileHash")
+        else:
+            ind_type = STIX_OBJECT_TYPES.get(obj_type, obj_type)
+        indicators.append({"type": ind_type, "indicator": value})
+    return indicators
+
+
+def _stix_indicators(obj: Dict[str, Any]) -> List[Dict[str, str]]:
+    if obj.get("type") == "indicator":
+        return parse_stix_pattern(obj.get("pattern", ""))
+    if obj.get("type") == "vulnerability":
+        return [{"type": "CVE", "indicator": obj.get("name", "")}]
+    return []
+
+
+def _stix_tags(obj: Dict[str, Any]) -> List[str]:
+    return list(obj.get("labels") or []) + list(obj.get("indicator_types") or [])
+
+
+class STIXBundleSource(FileSource):
+    """STIX 2.1 bundle: one pulse per report (its referenced indicators and
+    vulnerabilities), plus one pulse for each indicator/vulnerability no report references."""
+
+    kind = "stix"
+
+    def fetch_pulses(self) -> List[Dict[str, Any]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            bundle = json.load(f)
+        objects = bundle.get("objects", []) if isinstance(bundle, dict) else bundle
+        by_id = {o.get("id"): o for o in objects if isinstance(o, dict)}
+
+        pulses: List[Dict[str, Any]] = []
+        referenced = set()
+        for obj in objects:
+            if obj.get("type") != "report":
+                continue
+            indicators = []
+            for ref in obj.get("object_refs", []):
+                target = by_id.get(ref)
+                if target:
+                    found = _stix_indicators(target)
+                    if found:
+                        referenced.add(ref)
+                        indicators.extend(found)
+            pulses.append({
+                "name": obj.get("name"),
+                "created": obj.get("published") or obj.get("created"),
+                "tags": _stix_tags(obj),
+                "references": obj.get("external_references") or [],
+                "indicators": indicators,
+            })
+
+        for obj in objects:
+            if obj.get("id") in referenced or obj.get("type") not in ("indicator", "vulnerability"):
+                continue
+            pulses.append({
+                "name": obj.get("name") or obj.get("description") or obj.get("id"),
+                "created": obj.get("valid_from") or obj.get("created"),
+                "tags": _stix_tags(obj),
+                "references": obj.get("external_references") or [],
+                "indicators": _stix_indicators(obj),
+            })
+        return pulses
+
+
+# --- MISP ---
+
+MISP_TYPES = {
+    "ip-src": "IPv4", "ip-dst": "IPv4", "ip-src|port": "IPv4", "ip-dst|port": "IPv4",
+    "domain": "domain", "domain|ip": "domain", "hostname": "hostname",
+    "url": "URL", "uri": "URL", "link": "URL",
+    "md5": "FileHash-MD5", "sha1": "FileHash-SHA1", "sha256": "FileHash-SHA256",
+    "filename|md5": "FileHash-MD5", "filename|sha1": "FileHash-SHA1", "filename|sha256": "FileHash-SHA256",
+    "email": "email", "email-src": "email", "email-dst": "email",
+    "vulnerability": "CVE", "mutex": "Mutex", "yara": "YARA",
+}
+
+
+def _misp_events(data: Any) -> Iterable[Dict[str, Any]]:
+    if isinstance(data, dict) and "response" in data:
+        data = data["response"]
+    if isinstance(data, dict):
+        data = [data]
+    for item in data or []:
+        event = item.get("Event", item) if isinstance(item, dict) else None
+        if event:
+            yield event
+
+
+def _misp_indicator(attr: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    attr_type = attr.get("type", "")
+    value = str(attr.get("value", ""))
+    if not value:
+        return None
+    if "|" in attr_type:
+        # Composite attributes: "filename|sha256" keeps the hash, "ip-dst|port" keeps the IP
+        parts = value.split("|")
+        value = parts[-1] if attr_type.startswith("filename|") else parts[0]
+    ind_type = MISP_TYPES.get(attr_type) or infer_indicator_type(value)
+    if ind_type == "IPv4" and ":" in value:
+        ind_type = "IPv6"
+    return {"type": ind_type, "indicator": value}
+
+
+def _misp_created(event: Dict[str, Any]) -> Optional[str]:
+    """Event `date`, or its epoch `timestamp` (int or string) as an ISO date."""
+    if event.get("date"):
+        return str(event["date"])
+    try:
+        return datetime.fromtimestamp(int(event["timestamp"]), tz=timezone.utc).date().isoformat()
+    except (KeyError, TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+class MISPSource(FileSource):
+    """MISP JSON export (`{"response": [{"Event": ...}]}`, a list of events, or one event)."""
+
+    kind = "misp"
+
+    def fetch_pulses(self) -> List[Dict[str, Any]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        pulses = []
+        for event in _misp_events(data):
+            attributes = list(event.get("Attribute") or [])
+            for obj in event.get("Object") or []:
+                attributes.extend(obj.get("Attribute") or [])
+            indicators = [i for i in (_misp_indicator(a) for a in attributes if a.get("to_ids", True)) if i]
+            pulses.append({
+                "name": event.get("info"),
+                "created": _misp_created(event),
+                "tags": [t.get("name", "") for t in event.get("Tag") or []],
+                # External references are the event's link attributes (attribute_count is not one)
+                "references": [a.get("value") for a in attributes if a.get("type") == "link" and a.get("value")],
+                "indicators": indicators,
+            })
+        return pulses
+
+
+# --- CSV ---
+
+CSV_VALUE_COLUMNS = ("indicator", "value", "ioc", "observable")
+CSV_NAME_COLUMNS = ("threat_name", "name", "description", "title")
+
+
+class CSVSource(FileSource):
+    """CSV IOC list with a header row. Rows sharing a threat name become one pulse;
+    a missing `type` column is inferred from the value."""
+
+    kind = "csv"
+
+    def fetch_pulses(self) -> List[Dict[str, Any]]:
+        pulses: Dict[str, Dict[str, Any]] = {}
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            columns = {c.lower().strip(): c for c in reader.fieldnames or []}
+            value_col = next((columns[c] for c in CSV_VALUE_COLUMNS if c in columns), None)
+            if value_col is None:
+                raise ValueError(f"{self.path}: no indicator column (expected one of {', '.join(CSV_VALUE_COLUMNS)})")
+            name_col = next((columns[c] for c in CSV_NAME_COLUMNS if c in columns), None)
+            type_col = columns.get("type")
+            tags_col = columns.get("tags")
+            created_col = columns.get("created") or columns.get("date")
+
+            for row in reader:
+                value = (row.get(value_col) or "").strip()
+                if not value:
+                    continue
+                name = (row.get(name_col) if name_col else None) or f"{self.path.name} IOC list"
+                pulse = pulses.get(name)
+                if pulse is None:
+                    pulse = pulses[name] = {
+                        "name": name,
+                        "created": row.get(created_col) if created_col else None,
+                        "tags": [],
+                        "indicators": [],
+                    }
+                if tags_col and row.get(tags_col):
+                    for tag in re.split(r"[;|]", row[tags_col]):
+                        tag = tag.strip()
+                        if tag and tag not in pulse["tags"]:
+                            pulse["tags"].append(tag)
+                ind_type = (row.get(type_col) if type_col else None) or infer_indicator_type(value)
+                pulse["indicators"].append({"type": ind_type, "indicator": value})
+        return list(pulses.values())
+
+
+SOURCE_KINDS = {cls.kind: cls for cls in (STIXBundleSource, MISPSource, CSVSource)}
+
+
+def parse_sources_config(spec: Optional[str], base_dir: Optional[Path] = None) -> List[Source]:
+    """Build file sources from a `kind:path,kind:path` string (see module docstring).
+
+    Relative paths are resolved against `base_dir` when given.
+    """
+    sources: List[Source] = []
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        kind, sep, path = entry.partition(":")
+        if not sep or kind.lower() not in SOURCE_KINDS:
+            raise ValueError(f"Invalid CTI_SOURCES entry {entry!r}; expected one of {', '.join(SOURCE_KINDS)} as kind:path")
+        file_path = Path(path)
+        if base_dir is not None and not file_path.is_absolute():
+            file_path = base_dir / file_path
+        sources.append(SOURCE_KINDS[kind.lower()](str(file_path)))
+    return sources
@@ -0,0 +1,288 @@
+"""Background LLM summaries of the top matched threats per asset.
+
+The snapshot's indicators are grouped back into pulses (same source and threat name).
+Each pulse is keyed by a hash of its stable content, so a summary is generated once,
+shared by every asset the pulse matches, and reused until the pulse changes.
+Summaries live in a small SQLite store with LRU eviction. Selecting, hashing and
+generating missing summaries all happen on a background thread, so request handlers
+only ever read the store and never wait on the model.
+
+SUMMARY_BACKEND selects the model: `anthropic` (needs ANTHROPIC_API_KEY and the
+`anthropic` package), `stub`, a deterministic local model for offline use and tests,
+or `off` to disable summaries entirely (benchmarks and load tests). Without an
+Anthropic key the stub is always used.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import defaultdict
+from pathlib import Path
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import metrics
+
+BASE_DIR = Path(__file__).parent
+SUMMARY_DB = Path(os.getenv("SUMMARY_DB", str(BASE_DIR / "summaries.db")))
+SUMMARY_MAX_ENTRIES = int(os.getenv("SUMMARY_MAX_ENTRIES", "5000"))
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "10"))
+SUMMARY_TOP_N = int(os.getenv("SUMMARY_TOP_N", "5"))
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "claude-3-5-haiku-latest")
+
+# Indicators per pulse sent to the model; enough for context without blowing up prompts
+MAX_PROMPT_INDICATORS = 20
+
+PulseKey = Tuple[str, str]
+
+
+def pulse_key(threat: Dict[str, Any]) -> PulseKey:
+    return (threat.get("source", ""), threat.get("threat_name", ""))
+
+
+def content_hash(pulse: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(pulse, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PulseCatalog:
+    """Every pulse in one indicator snapshot, rebuilt from all of its normalized indicators.
+
+    A pulse's hash covers its full stable content (tags, every indicator, the upstream
+    modified time), not just the indicators an asset matched, so it is summarized once,
+    shared by every asset it matches, and not redone when only its popularity changes.
+    Hashes are computed on first use and memoized.
+    """
+
+    def __init__(self, indicators: List[Dict[str, Any]]):
+        self._groups: Dict[PulseKey, List[Dict[str, Any]]] = defaultdict(list)
+        for t in indicators:
+            self._groups[pulse_key(t)].append(t)
+        self._pulses: Dict[PulseKey, Tuple[str, Dict[str, Any]]] = {}
+        self._score = {key: max(t.get("score", 0) for t in items) for key, items in self._groups.items()}
+        self._lock = threading.Lock()
+
+    def _build(self, key: PulseKey) -> Tuple[str, Dict[str, Any]]:
+        items = self._groups[key]
+        top = max(items, key=lambda x: x.get("score", 0))
+        indicators = sorted({f"{i.get('type')}: {i.get('value')}" for i in items if i.get("type") != "pulse"})
+        pulse = {
+            "threat_name": key[1],
+            "source": key[0],
+            "severity": top.get("severity"),
+            "score": top.get("score", 0),
+            "tags": top.get("tags") or [],
+            "created": top.get("created"),
+            "references": top.get("references", 0),
+            "indicator_count": len(indicators),
+        }
+        # Only stable content: score, severity and references follow the upstream subscriber
+        # count and `created` may be the ingest time, so they would re-summarize unchanged pulses
+        digest = content_hash({
+            "source": key[0],
+            "threat_name": key[1],
+            "tags": sorted({tag for t in items for tag in (t.get("tags") or [])}),
+            "indicators": indicators,
+            "modified": sorted({t["modified"] for t in items if t.get("modified")}),
+        })
+        return digest, {**pulse, "indicators": indicators[:MAX_PROMPT_INDICATORS]}
+
+    def get(self, key: PulseKey) -> Tuple[str, Dict[str, Any]]:
+        """(content hash, pulse) for one pulse key."""
+        with self._lock:
+            entry = self._pulses.get(key)
+            if entry is None:
+                entry = self._pulses[key] = self._build(key)
+            return entry
+
+    def top(self, threats: List[Dict[str, Any]], n: int = SUMMARY_TOP_N) -> List[Tuple[str, Dict[str, Any]]]:
+        """The n highest scoring pulses among those `threats` belong to."""
+        keys = sorted({pulse_key(t) for t in threats}, key=lambda k: self._score[k], reverse=True)
+        return [self.get(key) for key in keys[:n]]
+
+
+class SummaryStore:
+    """Persistent hash -> summary map; least recently used entries are evicted past max_entries."""
+
+    def __init__(self, path: Path = SUMMARY_DB, max_entries: int = SUMMARY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "hash TEXT PRIMARY KEY, summary TEXT NOT NULL, model TEXT, created_at REAL, last_used_at REAL)"
+        )
+        self._db.commit()
+
+    def get_many(self, hashes: List[str]) -> Dict[str, str]:
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT hash, summary FROM summaries WHERE hash IN ({placeholders})", hashes).fetchall()
+            if rows:
+                self._db.executemany("UPDATE summaries SET last_used_at = ? WHERE hash = ?",
+                                     [(time.time(), h) for h, _ in rows])
+                self._db.commit()
+        return dict(rows)
+
+    def put_many(self, summaries: Dict[str, str], model: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO summaries (hash, summary, model, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                [(h, s, model, now, now) for h, s in summaries.items()])
+            self._db.execute(
+                "DELETE FROM summaries WHERE hash IN (SELECT hash FROM summaries ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+
+class StubModel:
+    """Deterministic offline stand-in for the LLM."""
+
+    name = "stub"
+
+    def summarize_batch(self, pulses: List[Dict[str, Any]]) -> List[str]:
+        summaries = []
+        for p in pulses:
+            kinds = sorted({i.split(":", 1)[0] for i in p["indicators"]})
+            tags = ", ".join(p["tags"][:3]) or "no tags"
+            summaries.append(
+                f"{p['severity']} ({p['score']}) threat \"{p['threat_name']}\" from {p['source']}: "
+                f"{p['indicator_count']} indicators ({', '.join(kinds) or 'pulse only'}); tagged {tags}."
+            )
+        return summaries
+
+
+class AnthropicModel:
+    name = "anthropic"
+
+    def __init__(self, api_key: str, model: str = SUMMARY_MODEL):
+        import anthropic
+
+        self.client = anthropic.Anthropic(api_key=api_key)
+        self.model = model
+
+    def summarize_batch(self, pulses: List[Dict[str, Any]]) -> List[str]:
+        items = {str(i): p for i, p in enumerate(pulses)}
+        prompt = (
+            "Summarize each threat intelligence item below in 1-2 sentences for a security analyst: "
+            "what the threat is, what it targets, and why it matters. Reply with only a JSON object "
+            "mapping each item id to its summary.\n\n" + json.dumps(items, default=str)
+        )
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=200 * len(pulses),
+            messages=[{"role": "user", "content": prompt}],
+        )
+        text = "".join(block.text for block in message.content if getattr(block, "type", "") == "text")
+        parsed = json.loads(text[text.index("{"):text.rindex("}") + 1])
+        return [str(parsed.get(str(i), "")).strip() for i in range(len(pulses))]
+
+
+def summary_backend() -> str:
+    return (os.getenv("SUMMARY_BACKEND") or "").strip().lower()
+
+
+def summaries_enabled() -> bool:
+    return summary_backend() != "off"
+
+
+def default_model():
+    backend = summary_backend()
+    api_key = (os.getenv("ANTHROPIC_API_KEY") or "").strip()
+    if backend == "stub" or not api_key:
+        return StubModel()
+    try:
+        return AnthropicModel(api_key)
+    except Exception as e:
+        print(f"Anthropic summarizer unavailable, using stub: {e}")
+        return StubModel()
+
+
+class SummaryService:
+    """Summarizes selected pulses on a background thread.
+
+    `submit` only records the latest (indicators, assets) pair and wakes the worker;
+    choosing the pulses, hashing them and checking the store all happen on the worker
+    via `select`, so request handlers never pay for them. Submissions made while the
+    worker is busy are coalesced into the newest one.
+    """
+
+    def __init__(self, store: SummaryStore, model, select: Callable[[Any, Any], List[Tuple[str, Dict[str, Any]]]],
+                 batch_size: int = SUMMARY_BATCH_SIZE):
+        self.store = store
+        self.model = model
+        self.select = select
+        self.batch_size = batch_size
+        self._job: Optional[tuple] = None
+        self._pending: set = set()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, indicators: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> None:
+        """Hand the current snapshot and assets to the worker; returns immediately."""
+        with self._cond:
+            self._job = (indicators, assets)
+            self._cond.notify()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="summary-worker", daemon=True)
+                self._worker.start()
+
+    def lookup(self, pulses: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Attach stored summaries (or a pending/missing status) without calling the model."""
+        found = self.store.get_many([h for h, _ in pulses])
+        result = []
+        for h, p in pulses:
+            summary = found.get(h)
+            metrics.SUMMARY_CACHE.inc(result="hit" if summary else "miss")
+            status = "ready" if summary else ("pending" if h in self._pending else "missing")
+            result.append({**p, "hash": h, "summary": summary, "status": status})
+        return result
+
+    def _next_job(self) -> tuple:
+        with self._cond:
+            while self._job is None:
+                self._cond.wait()
+            job, self._job = self._job, None
+            return job
+
+    def _missing(self, job: tuple) -> List[Tuple[str, Dict[str, Any]]]:
+        selected = dict(self.select(*job))  # one entry per pulse, however many assets it matches
+        known = self.store.get_many(list(selected))
+        with self._cond:
+            todo = [(h, p) for h, p in selected.items() if h not in known and h not in self._pending]
+            self._pending.update(h for h, _ in todo)
+        return todo
+
+    def _run(self) -> None:
+        while True:
+            try:
+                todo = self._missing(self._next_job())
+            except Exception as e:
+                print(f"Summary scheduling error: {e}")
+                continue
+            for start in range(0, len(todo), self.batch_size):
+                batch = todo[start:start + self.batch_size]
+                try:
+                    with metrics.time_stage("summarize"):
+                        summaries = self.model.summarize_batch([p for _, p in batch])
+                    self.store.put_many({h: s for (h, _), s in zip(batch, summaries) if s}, self.model.name)
+                    metrics.SUMMARY_BATCHES.inc(result="ok")
+                except Exception as e:
+                    metrics.SUMMARY_BATCHES.inc(result="error")
+                    print(f"Summary error: {e}")
+                finally:
+                    with self._cond:
+                        self._pending.difference_update(h for h, _ in batch)